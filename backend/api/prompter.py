@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import threading
+from typing import Any, Iterable, Mapping
+
 from flask import Blueprint, jsonify, request
 
 from backend.services import config
@@ -20,16 +23,43 @@ api_bp = Blueprint("prompter_api", __name__, url_prefix="/api")
 logger = get_logger(__name__)
 
 _workflow: LyricWorkflow | None = None
+_workflow_lock = threading.Lock()
 
 
 def _get_workflow() -> LyricWorkflow:
-    """Lazily initialize a workflow instance so we avoid construction on import."""
+    """
+    Lazily initialize a workflow instance so we avoid construction on import.
+
+    create_app calls this up front when WARM_START_AGENTS is set, so the warm-up is
+    already under way when the first request arrives.
+    """
     global _workflow
     if _workflow is None:
-        _workflow = LyricWorkflow()
+        # Concurrent first requests must not each build clients, agents, and a loop thread
+        with _workflow_lock:
+            if _workflow is None:
+                _workflow = LyricWorkflow(
+                    review_final_iteration=config.review_final_iteration,
+                    warm_start=config.warm_start_agents,
+                )
     return _workflow
 
 
+# WorkflowInputs fields that are read verbatim from request payloads
+_INPUT_FIELDS = ("artists", "songs", "guidance", "lyrics", "idea", "producer_guidance")
+_REFERENCE_FIELDS = ("artists", "songs", "guidance", "lyrics")
+
+
+def _inputs_from_payload(payload: Mapping[str, Any], fields: Iterable[str] = _INPUT_FIELDS) -> WorkflowInputs:
+    """Build WorkflowInputs from the given payload fields, treating missing/null values as empty."""
+    return WorkflowInputs(**{name: payload.get(name) or "" for name in fields})
+
+
+def _has_reference(inputs: WorkflowInputs) -> bool:
+    """Return True when at least one reference input (artists, songs, lyrics, guidance) is present."""
+    return any(getattr(inputs, name).strip() for name in _REFERENCE_FIELDS)
+
+
 def _serialize_feedback(entry: FeedbackEntry) -> dict:
     """Convert FeedbackEntry dataclass into JSON-friendly dict."""
     return {
@@ -95,15 +125,10 @@ def generate_prompt():
         )
 
     # Validate required user input
-    artists = payload.get("artists", "") or ""
-    songs = payload.get("songs", "") or ""
-    guidance = payload.get("guidance", "") or ""
-    lyrics = payload.get("lyrics", "") or ""
-    idea = payload.get("idea", "") or ""
-    producer_guidance = payload.get("producer_guidance", "") or ""
+    inputs = _inputs_from_payload(payload)
     include_producer = bool(payload.get("include_producer"))
 
-    if not any([artists.strip(), songs.strip(), guidance.strip(), lyrics.strip()]):
+    if not _has_reference(inputs):
         return (
             jsonify(
                 {
@@ -114,7 +139,7 @@ def generate_prompt():
             400,
         )
 
-    if not idea.strip():
+    if not inputs.idea.strip():
         return (
             jsonify(
                 {
@@ -126,14 +151,6 @@ def generate_prompt():
         )
 
     try:
-        inputs = WorkflowInputs(
-            artists=artists,
-            songs=songs,
-            guidance=guidance,
-            lyrics=lyrics,
-            idea=idea,
-            producer_guidance=producer_guidance,
-        )
         workflow = _get_workflow()
         state = workflow.run(inputs)
 
@@ -158,12 +175,9 @@ def generate_template():
     if config_errors:
         return jsonify({"error": "Invalid configuration", "details": config_errors}), 400
 
-    artists = payload.get("artists", "") or ""
-    songs = payload.get("songs", "") or ""
-    guidance = payload.get("guidance", "") or ""
-    lyrics = payload.get("lyrics", "") or ""
+    inputs = _inputs_from_payload(payload, _REFERENCE_FIELDS)
 
-    if not any([artists.strip(), songs.strip(), guidance.strip(), lyrics.strip()]):
+    if not _has_reference(inputs):
         return (
             jsonify(
                 {
@@ -174,13 +188,6 @@ def generate_template():
             400,
         )
 
-    inputs = WorkflowInputs(
-        artists=artists,
-        songs=songs,
-        guidance=guidance,
-        lyrics=lyrics,
-    )
-
     workflow = _get_workflow()
     state = workflow.generate_template(inputs)
     status_code = 200 if state.status != WorkflowStatus.ERROR else 400
@@ -196,27 +203,15 @@ def generate_lyrics():
     if config_errors:
         return jsonify({"error": "Invalid configuration", "details": config_errors}), 400
 
-    artists = payload.get("artists", "") or ""
-    songs = payload.get("songs", "") or ""
-    guidance = payload.get("guidance", "") or ""
-    lyrics = payload.get("lyrics", "") or ""
-    idea = payload.get("idea", "") or ""
+    inputs = _inputs_from_payload(payload, (*_REFERENCE_FIELDS, "idea"))
     template = payload.get("template", "") or ""
 
     if not template.strip():
         return jsonify({"error": "Missing template", "details": "Generate a template first."}), 400
 
-    if not idea.strip():
+    if not inputs.idea.strip():
         return jsonify({"error": "Missing idea/title", "details": "Provide a song idea or title."}), 400
 
-    inputs = WorkflowInputs(
-        artists=artists,
-        songs=songs,
-        guidance=guidance,
-        lyrics=lyrics,
-        idea=idea,
-    )
-
     workflow = _get_workflow()
     state = workflow.generate_lyrics(inputs, template)
     status_code = 200 if state.status != WorkflowStatus.ERROR else 400
@@ -232,26 +227,15 @@ def generate_production():
     if config_errors:
         return jsonify({"error": "Invalid configuration", "details": config_errors}), 400
 
-    lyrics = payload.get("lyrics", "") or ""
+    inputs = _inputs_from_payload(payload)
     template = payload.get("template", "") or ""
-    idea = payload.get("idea", "") or ""
-    producer_guidance = payload.get("producer_guidance", "") or ""
 
-    if not lyrics.strip():
+    if not inputs.lyrics.strip():
         return jsonify({"error": "Missing lyrics", "details": "Generate lyrics before running the producer."}), 400
 
-    inputs = WorkflowInputs(
-        artists=payload.get("artists", "") or "",
-        songs=payload.get("songs", "") or "",
-        guidance=payload.get("guidance", "") or "",
-        lyrics=payload.get("lyrics", "") or "",
-        idea=idea,
-        producer_guidance=producer_guidance,
-    )
-
     state = WorkflowState(
         inputs=inputs,
-        outputs=WorkflowOutputs(template=template, idea=idea, lyrics=lyrics),
+        outputs=WorkflowOutputs(template=template, idea=inputs.idea, lyrics=inputs.lyrics),
         status=WorkflowStatus.COMPLETE,
     )
 
@@ -6,7 +6,6 @@ import sys
 from pathlib import Path
 from typing import Iterable
 
-from dotenv import load_dotenv
 from flask import Flask, jsonify, send_from_directory
 from flask_cors import CORS
 
@@ -17,6 +16,9 @@ if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 DIST_DIR = BASE_DIR / "frontend" / "dist"
 
+# Set once the default .env search has run; repeated create_app calls skip the file I/O
+_env_loaded = False
+
 
 def load_environment(env_paths: Iterable[Path] | None = None) -> None:
     """
@@ -27,8 +29,15 @@ def load_environment(env_paths: Iterable[Path] | None = None) -> None:
     2. Project root .env
     3. ~/.suno-prompter/.env
     """
+    global _env_loaded  # noqa: PLW0603
+    if env_paths is None and _env_loaded:
+        return
+
+    from dotenv import load_dotenv
+
     candidates = list(env_paths or [])
     if not candidates:
+        _env_loaded = True
         project_root = Path(__file__).resolve().parent.parent
         candidates = [
             project_root / "backend" / ".env",
@@ -67,10 +76,15 @@ def create_app() -> Flask:
         """Simple health check endpoint."""
         return jsonify({"status": "ok"}), 200
 
-    from backend.api.prompter import api_bp
+    from backend.api.prompter import _get_workflow, api_bp
+    from backend.services import config
 
     app.register_blueprint(api_bp)
 
+    if config.warm_start_agents:
+        # Build the workflow now so its warm-up runs before the first request, not inside it
+        _get_workflow()
+
     if DIST_DIR.exists():
         logger.info("Serving frontend assets from %s", DIST_DIR)
 
@@ -1,5 +1,5 @@
 """Service layer for the Flask backend."""
 
-from .config import config
+from .config import config, get_config
 
-__all__ = ["config"]
+__all__ = ["config", "get_config"]
@@ -4,7 +4,7 @@ from .lyric_template_agent import create_lyric_template_agent
 from .lyric_writer_agent import create_lyric_writer_agent
 from .lyric_reviewer_agent import create_lyric_reviewer_agent
 from .suno_producer_agent import create_suno_producer_agent
-from .factory import create_chat_client
+from .factory import ChatClient, create_chat_client
 
 __all__ = [
     "create_lyric_template_agent",
@@ -12,4 +12,5 @@ __all__ = [
     "create_lyric_reviewer_agent",
     "create_suno_producer_agent",
     "create_chat_client",
+    "ChatClient",
 ]
@@ -1,16 +1,19 @@
 """Chat client factory for creating configured client instances."""
 
+from functools import lru_cache
 from typing import Union
 
 from agent_framework.azure import AzureOpenAIChatClient
 from agent_framework.openai import OpenAIChatClient
-from ..config import config
+from ..config import LLMConfig, config
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+ChatClient = Union[OpenAIChatClient, AzureOpenAIChatClient]
 
-def create_chat_client(agent_name: str) -> Union[OpenAIChatClient, AzureOpenAIChatClient]:
+
+def create_chat_client(agent_name: str) -> ChatClient:
     """
     Create a chat client for the specified agent using the resolved provider config.
 
@@ -29,24 +32,24 @@ def create_chat_client(agent_name: str) -> Union[OpenAIChatClient, AzureOpenAICh
         raise ValueError(f"Invalid configuration: {', '.join(errors)}")
 
     agent_config = config.get_agent_llm_config(agent_name)
+    logger.debug("Resolved %s chat client for %s", agent_config.provider, agent_name)
+
+    # Agents that resolve to the same settings share one client and its connection pool
+    return _build_chat_client(agent_config)
 
+
+@lru_cache(maxsize=8)
+def _build_chat_client(agent_config: LLMConfig) -> ChatClient:
+    """Construct a chat client; memoized so identical settings reuse one instance."""
     if agent_config.provider == "azure":
-        logger.info(
-            "Creating Azure OpenAI chat client for %s (deployment: %s)",
-            agent_name,
-            agent_config.deployment_name,
-        )
+        logger.info("Creating Azure OpenAI chat client (deployment: %s)", agent_config.deployment_name)
         return AzureOpenAIChatClient(
             endpoint=agent_config.endpoint,
             api_key=agent_config.api_key,
             deployment_name=agent_config.deployment_name,
         )
 
-    logger.info(
-        "Creating OpenAI-compatible chat client for %s (model: %s)",
-        agent_name,
-        agent_config.model_id,
-    )
+    logger.info("Creating OpenAI-compatible chat client (model: %s)", agent_config.model_id)
     if agent_config.base_url:
         logger.info("Using custom endpoint: %s", agent_config.base_url)
 
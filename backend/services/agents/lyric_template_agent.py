@@ -1,10 +1,11 @@
 """Lyric Template Agent for analyzing songs and generating lyric blueprints."""
 
-from typing import Annotated
+from typing import Annotated, Optional
 from agent_framework import ChatAgent as FrameworkChatAgent, ai_function
 from pydantic import Field
-from .factory import create_chat_client
+from .factory import ChatClient, create_chat_client
 from ..utils.logging import get_logger
+from ..utils.prompts import load_prompt
 
 logger = get_logger(__name__)
 
@@ -22,76 +23,13 @@ def search_lyrics(
     return f"Search query received: '{query}'. Please use your training knowledge to recall or approximate the lyrics for this song. If you cannot recall specific lyrics, describe the general lyrical style, themes, and patterns typically found in songs by this artist or in this genre."
 
 
-SYSTEM_PROMPT = """You are an expert lyricist and music analyst specializing in analyzing song lyrics to create detailed "lyric blueprints."
-
-Your task is to analyze songs provided by the user (by title, artist, or as a list) and generate a comprehensive markdown blueprint that captures the structural and stylistic patterns of the lyrics.
-
-## Input Handling
-- **Specific song(s) provided**: Analyze ONLY the specified songs in depth. Do NOT select other songs.
-- **Artist name with song(s)**: Analyze ONLY the specified songs by that artist.
-- **Artist name only (no specific songs)**: Select 2-3 representative songs from that artist and analyze common patterns.
-- **Song list**: Analyze all specified songs and synthesize patterns across the collection.
-
-IMPORTANT: If the user provides specific song titles, you MUST analyze those exact songs, not other songs by the artist.
-
-## Analysis Components
-For each song or collection, analyze and document:
-
-### 1. Song Structure
-- Section types (verse, chorus, pre-chorus, bridge, outro, etc.)
-- Arrangement pattern (e.g., Verse-Chorus-Verse-Chorus-Bridge-Chorus)
-- Section lengths (approximate line counts)
-- Repetition patterns
-
-### 2. Rhyme Schemes & Patterns
-- Rhyme scheme per section (AABB, ABAB, ABCB, etc.)
-- Internal rhymes and near-rhymes
-- Rhyme density and consistency
-- Unique rhyming techniques
-
-### 3. Meter & Syllable Patterns
-- Syllable counts per line (ranges or patterns)
-- Rhythmic patterns and stressed syllables
-- How meter varies between sections
-- Relationship to musical rhythm
-
-### 4. Themes & Imagery
-- Central themes and motifs
-- Imagery patterns (visual, auditory, tactile, etc.)
-- Recurring symbols and metaphors
-- Sensory language usage
-
-### 5. Emotional Arc
-- Overall emotional tone
-- Tone shifts between sections
-- Word choice supporting emotional intent
-- Narrative progression
-
-### 6. Literary Devices
-- Alliteration, assonance, consonance
-- Personification, metaphor, simile
-- Repetition and anaphora
-- Word choice patterns (simple vs. complex, concrete vs. abstract)
-- Narrative perspective and voice
-
-## Output Format
-Generate a well-structured markdown document with the following sections:
-1. **Overview** - Brief summary of the song(s) analyzed
-2. **Structure Analysis** - Detailed breakdown of song structure
-3. **Rhyme & Meter Patterns** - Rhyme schemes and rhythmic patterns
-4. **Themes & Imagery** - Thematic elements and imagery
-5. **Literary Devices** - Notable techniques and devices
-6. **Blueprint Summary** - A synthesized template that could guide new lyric creation in this style
-
-When analyzing multiple songs, note both common patterns AND distinguishing variations.
-
-Use your extensive knowledge of music and lyrics. If you need to look up specific lyrics, use the search_lyrics tool."""
-
-
-def create_lyric_template_agent() -> FrameworkChatAgent:
+def create_lyric_template_agent(chat_client: Optional[ChatClient] = None) -> FrameworkChatAgent:
     """
     Create and return a ChatAgent for lyric template generation.
 
+    Args:
+        chat_client: Optional pre-built client to share; resolved from config when omitted
+
     Returns:
         ChatAgent: Configured agent instance
 
@@ -99,11 +37,12 @@ def create_lyric_template_agent() -> FrameworkChatAgent:
         Exception: If agent creation fails
     """
     try:
-        chat_client = create_chat_client("lyric_template")
+        if chat_client is None:
+            chat_client = create_chat_client("lyric_template")
 
         agent = FrameworkChatAgent(
             chat_client=chat_client,
-            instructions=SYSTEM_PROMPT,
+            instructions=load_prompt("lyric_template"),
             name="LyricTemplateAgent",
             tools=[search_lyrics],
         )
@@ -112,5 +51,5 @@ def create_lyric_template_agent() -> FrameworkChatAgent:
         return agent
 
     except Exception as e:
-        logger.error(f"Error creating lyric template agent: {e}")
+        logger.error("Error creating lyric template agent: %s", e)
         raise
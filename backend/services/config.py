@@ -2,15 +2,16 @@
 
 import os
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Dict, List, Optional
+from functools import cache
+from typing import Dict, List, Optional, Tuple
 
 
-# NOTE: dotenv loading is handled by cli.py
+# NOTE: dotenv loading is handled by backend.app.load_environment before this module is imported
 # This allows flexibility in .env file locations
 
 
-SUPPORTED_PROVIDERS = {"openai", "azure"}
+SUPPORTED_PROVIDERS = frozenset({"openai", "azure"})
+_SUPPORTED_PROVIDERS_SORTED = tuple(sorted(SUPPORTED_PROVIDERS))
 
 # Map logical agent names to env var prefixes for overrides
 AGENT_ENV_PREFIXES: Dict[str, str] = {
@@ -20,10 +21,20 @@ AGENT_ENV_PREFIXES: Dict[str, str] = {
     "suno_producer": "PRODUCER",
 }
 
+# Env var names for each agent's overrides: (provider, model ID, Azure deployment)
+_AGENT_OVERRIDE_KEYS: Dict[str, Tuple[str, str, str]] = {
+    agent_name: (f"{prefix}_LLM_PROVIDER", f"{prefix}_CHAT_MODEL_ID", f"{prefix}_AZURE_DEPLOYMENT_NAME")
+    for agent_name, prefix in AGENT_ENV_PREFIXES.items()
+}
+_AGENT_NAMES_SORTED = tuple(sorted(AGENT_ENV_PREFIXES))
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LLMConfig:
-    """Resolved configuration for a specific agent/provider combination."""
+    """Resolved configuration for a specific agent/provider combination.
+
+    Frozen (and therefore hashable) so resolved configs can be shared safely and used as cache keys.
+    """
 
     provider: str
     model_id: Optional[str] = None
@@ -56,28 +67,90 @@ class Config:
         self.DEBUG: bool = os.getenv("APP_DEBUG", "false").lower() == "true"
         self.LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+        # Per-agent overrides, snapshotted alongside the settings above
+        self._agent_env: Dict[str, Optional[str]] = {}
+        for provider_key, model_key, deployment_key in _AGENT_OVERRIDE_KEYS.values():
+            # Provider names are matched case-insensitively; normalize once at read time
+            provider = os.getenv(provider_key)
+            self._agent_env[provider_key] = provider.lower() if provider else provider
+            self._agent_env[model_key] = os.getenv(model_key)
+            self._agent_env[deployment_key] = os.getenv(deployment_key)
+
+        # Malformed numeric settings fall back to safe values and surface via get_validation_errors
+        self._setting_errors: List[str] = []
+
+        # Upper bound on a single agent call; 0 disables the timeout
+        self.agent_timeout_seconds: float = self._read_number("AGENT_TIMEOUT_SECONDS", 120.0)
+
+        # Lyric drafts written and reviewed in parallel per iteration
+        self.lyric_candidates: int = self._read_number("LYRIC_CANDIDATES", 1, cast=int, minimum=1)
+
+        # Reuse producer output for identical lyrics/template/guidance instead of re-sampling
+        self.cache_producer_output: bool = os.getenv("CACHE_PRODUCER_OUTPUT", "false").lower() == "true"
+
+        # Lifetime of cached agent responses in seconds; 0 keeps them until evicted by size
+        self.response_cache_ttl_seconds: float = self._read_number("RESPONSE_CACHE_TTL_SECONDS", 3600.0)
+
+        # SQLite file that persists cached agent responses across restarts; unset keeps them in memory
+        self.llm_cache_path: Optional[str] = os.getenv("LLM_CACHE_PATH") or None
+
+        # Ping every agent when the workflow is built; costs one small call per agent
+        self.warm_start_agents: bool = os.getenv("WARM_START_AGENTS", "false").lower() == "true"
+
+        # Review the last allowed draft; its feedback is shown but cannot drive another revision
+        self.review_final_iteration: bool = os.getenv("REVIEW_FINAL_ITERATION", "true").lower() == "true"
+
+        # Reject drafts that repeat multi-word reference titles/artists without a reviewer call
+        self.local_forbidden_check: bool = os.getenv("LOCAL_FORBIDDEN_CHECK", "false").lower() == "true"
+
+        # Environment is read once above, so resolved configs and validation results never change
+        self._agent_configs: Dict[str, LLMConfig] = {}
+        self._validation_errors: Optional[Tuple[str, ...]] = None
+
+    def _read_number(self, name: str, default: float, cast=float, minimum: float = 0):
+        """Read a numeric env setting, recording malformed or out-of-range values as errors."""
+        raw = os.getenv(name)
+        if raw is None or not raw.strip():
+            return default
+        try:
+            value = cast(raw)
+        except ValueError:
+            kind = "a whole number" if cast is int else "a number"
+            self._setting_errors.append(f"{name} must be {kind}, got {raw!r}")
+            return default
+        # Written as "not >=" so NaN is rejected too
+        if not value >= minimum:
+            self._setting_errors.append(f"{name} must be at least {minimum}, got {raw!r}")
+            return cast(minimum)
+        return value
+
     def _normalize_provider(self, provider: str) -> str:
-        provider_normalized = provider.lower()
-        if provider_normalized not in SUPPORTED_PROVIDERS:
-            raise ValueError(f"Unsupported provider '{provider}'. Supported providers: {sorted(SUPPORTED_PROVIDERS)}")
-        return provider_normalized
+        # Callers pass values already lowercased when read from the environment
+        if provider not in SUPPORTED_PROVIDERS:
+            raise ValueError(f"Unsupported provider '{provider}'. Supported providers: {list(_SUPPORTED_PROVIDERS_SORTED)}")
+        return provider
 
     def _get_agent_override(self, agent_name: str) -> Dict[str, Optional[str]]:
-        if agent_name not in AGENT_ENV_PREFIXES:
-            raise ValueError(f"Unknown agent '{agent_name}' - expected one of {sorted(AGENT_ENV_PREFIXES)}")
+        if agent_name not in _AGENT_OVERRIDE_KEYS:
+            raise ValueError(f"Unknown agent '{agent_name}' - expected one of {list(_AGENT_NAMES_SORTED)}")
 
-        prefix = AGENT_ENV_PREFIXES[agent_name]
+        provider_key, model_key, deployment_key = _AGENT_OVERRIDE_KEYS[agent_name]
         return {
-            "provider": os.getenv(f"{prefix}_LLM_PROVIDER"),
-            "model_id": os.getenv(f"{prefix}_CHAT_MODEL_ID"),
+            "provider": self._agent_env[provider_key],
+            "model_id": self._agent_env[model_key],
             # Azure-specific override to allow different deployments per agent
-            "deployment_name": os.getenv(f"{prefix}_AZURE_DEPLOYMENT_NAME"),
+            "deployment_name": self._agent_env[deployment_key],
         }
 
-    @lru_cache(maxsize=None)
     def get_agent_llm_config(self, agent_name: str) -> LLMConfig:
         """Return the resolved LLM config for the given agent."""
 
+        cached = self._agent_configs.get(agent_name)
+        if cached is None:
+            cached = self._agent_configs[agent_name] = self._resolve_agent_llm_config(agent_name)
+        return cached
+
+    def _resolve_agent_llm_config(self, agent_name: str) -> LLMConfig:
         override = self._get_agent_override(agent_name)
         provider = self._normalize_provider(override["provider"] or self.default_provider)
 
@@ -107,45 +180,57 @@ class Config:
     def get_validation_errors(self) -> List[str]:
         """Get a list of validation errors across all agents."""
 
-        errors: List[str] = []
-        seen: set[str] = set()
+        if self._validation_errors is None:
+            self._validation_errors = tuple(self._collect_validation_errors())
+        return list(self._validation_errors)
 
-        for agent_name in AGENT_ENV_PREFIXES:
+    def _collect_validation_errors(self) -> List[str]:
+        errors: List[str] = list(self._setting_errors)
+        # Provider-level messages repeat for every agent sharing the provider
+        seen: List[str] = []
+
+        for agent_name, prefix in AGENT_ENV_PREFIXES.items():
             try:
                 agent_config = self.get_agent_llm_config(agent_name)
             except ValueError as exc:  # unknown provider/agent
                 errors.append(str(exc))
                 continue
 
-            prefix = AGENT_ENV_PREFIXES[agent_name]
-
             if agent_config.provider == "azure":
                 if not agent_config.endpoint:
-                    seen.add("AZURE_OPENAI_ENDPOINT must be set for Azure provider")
+                    seen.append("AZURE_OPENAI_ENDPOINT must be set for Azure provider")
                 if not agent_config.api_key:
-                    seen.add("AZURE_OPENAI_API_KEY must be set for Azure provider")
+                    seen.append("AZURE_OPENAI_API_KEY must be set for Azure provider")
                 if not agent_config.deployment_name:
-                    seen.add(
+                    seen.append(
                         f"Azure deployment name missing for {agent_name}. "
                         f"Set {prefix}_AZURE_DEPLOYMENT_NAME or AZURE_OPENAI_DEPLOYMENT_NAME."
                     )
             elif agent_config.provider == "openai":
                 if not agent_config.model_id:
-                    seen.add(
+                    seen.append(
                         f"Model ID missing for {agent_name}. "
                         f"Set {prefix}_CHAT_MODEL_ID or OPENAI_CHAT_MODEL_ID."
                     )
                 if not agent_config.api_key and not agent_config.base_url:
-                    seen.add(
+                    seen.append(
                         "Either OPENAI_API_KEY or OPENAI_BASE_URL should be configured. "
                         "Set OPENAI_API_KEY for OpenAI API, or OPENAI_BASE_URL for custom endpoints."
                     )
             else:
                 errors.append(f"Unsupported provider '{agent_config.provider}' for {agent_name}")
 
-        errors.extend(sorted(seen))
+        # Dedupe while keeping first-seen (agent scan) order
+        errors.extend(dict.fromkeys(seen))
         return errors
 
 
+@cache
+def get_config() -> Config:
+    """Return the process-wide configuration, reading the environment only once."""
+
+    return Config()
+
+
 # Export configuration instance
-config = Config()
+config = get_config()
@@ -2,5 +2,7 @@
 
 from .logging import get_logger
 from .ideas import pick_random_idea
+from .cache import ResponseCache, SQLiteResponseCache
+from .prompts import load_prompt
 
-__all__ = ["get_logger", "pick_random_idea"]
+__all__ = ["get_logger", "pick_random_idea", "ResponseCache", "SQLiteResponseCache", "load_prompt"]
@@ -0,0 +1,129 @@
+"""Caches for agent responses, in memory or persisted to SQLite."""
+
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache mapping an (agent, prompt) pair to the agent's output.
+
+    Entries older than ttl seconds are treated as misses and dropped on access;
+    a ttl of 0 keeps entries until they are evicted by size.
+
+    Not thread-safe: LyricWorkflow only touches it from its event loop thread.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(agent_name: str, prompt: str) -> bytes:
+        """Return a compact digest identifying an agent/prompt pair."""
+        return hashlib.blake2b(f"{agent_name}|{prompt}".encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached output for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if not self.ttl or time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: bytes, value: str) -> None:
+        """Store value under key, evicting the least recently used entries past maxsize."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size for logging or diagnostics."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    ResponseCache persisted to a SQLite file so entries survive process restarts.
+
+    Expiry uses wall-clock time since monotonic clocks reset on restart, and size
+    eviction drops the oldest writes rather than the least recently read entries.
+    Lookups are single indexed queries, cheap enough to run on the event loop.
+    SQLite errors after construction (e.g. "database is locked" when several workers
+    share the file) are logged and treated as a miss or a skipped store.
+    """
+
+    def __init__(self, path: str, maxsize: int = 256, ttl: float = 3600) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.path = path
+        # WAL lets several app processes share one cache file
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key BLOB PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached output for key, or None on a miss."""
+        try:
+            row = self._conn.execute("SELECT value, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value, stored_at = row
+                if not self.ttl or time.time() - stored_at < self.ttl:
+                    self.hits += 1
+                    return value
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as exc:
+            logger.warning("Response cache read failed (%s); treating as a miss", exc)
+        self.misses += 1
+        return None
+
+    def set(self, key: bytes, value: str) -> None:
+        """Store value under key, dropping the oldest entries past maxsize."""
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.maxsize,),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Response cache write failed (%s); skipping store", exc)
+
+    def __len__(self) -> int:
+        try:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error as exc:
+            logger.warning("Response cache size query failed (%s)", exc)
+            return 0
@@ -1,12 +1,23 @@
 """Utilities for song idea generation."""
 
 import random
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _load_ideas() -> Tuple[str, ...]:
+    """Read and parse the packaged starter ideas once per process."""
+    # Load ideas from packaged data in backend/services/data
+    data_path = Path(__file__).resolve().parent.parent / "data" / "starter_ideas.txt"
+    content = data_path.read_text()
+    return tuple(line.strip() for line in content.splitlines() if line.strip())
+
+
 def pick_random_idea() -> str:
     """
     Pick a random song idea from the starter ideas file.
@@ -19,23 +30,19 @@ def pick_random_idea() -> str:
         ValueError: If starter ideas file is empty
     """
     try:
-        # Load ideas from packaged data in backend/services/data
-        data_path = Path(__file__).resolve().parent.parent / "data" / "starter_ideas.txt"
-        content = data_path.read_text()
-
-        ideas = [line.strip() for line in content.splitlines() if line.strip()]
+        ideas = _load_ideas()
 
         if not ideas:
             raise ValueError("Starter ideas file is empty")
 
         # Select random idea
         idea = random.choice(ideas)
-        logger.info(f"Selected random idea: {idea}")
+        logger.info("Selected random idea: %s", idea)
         return idea
 
     except FileNotFoundError:
         logger.error("Starter ideas file not found in package data")
         raise
     except Exception as e:
-        logger.error(f"Error picking random idea: {e}")
+        logger.error("Error picking random idea: %s", e)
         raise
@@ -0,0 +1,23 @@
+"""Utilities for loading agent system prompts from packaged data."""
+
+from functools import lru_cache
+from pathlib import Path
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "data" / "prompts"
+
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Load an agent system prompt, reading each file at most once per process.
+
+    Args:
+        name: Prompt file name (without the .md suffix) in services/data/prompts
+
+    Returns:
+        str: The prompt text
+
+    Raises:
+        FileNotFoundError: If the prompt file doesn't exist
+    """
+    return (PROMPTS_DIR / f"{name}.md").read_text(encoding="utf-8").strip()
@@ -1,22 +1,178 @@
 """Lyric workflow orchestration using Microsoft Agent Framework."""
 
 import asyncio
+import copy
 import json
+import logging
+import re
+import threading
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, List, Tuple
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterable, Optional, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # optional speedup; not available on Windows
+    uvloop = None
 
 from agent_framework import AgentRunEvent, AgentRunUpdateEvent, WorkflowFailedEvent
 from ..agents import create_lyric_template_agent, create_lyric_writer_agent, create_lyric_reviewer_agent, create_suno_producer_agent
+from ..agents.factory import ChatClient
 from ..agents.lyric_reviewer_agent import ReviewerFeedback
+from ..config import config
+from ..utils.cache import ResponseCache, SQLiteResponseCache
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the same error either way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 # Constants
 MAX_ITERATIONS = 3
+RESPONSE_CACHE_SIZE = 256
+
+# Template responses containing any of these mean the agent could not ground itself in real lyrics
+_FAILURE_MARKERS = (
+    "could not find",
+    "couldn't find",
+    "no lyrics",
+    "lyrics not found",
+    "not enough reference",
+    "insufficient reference",
+    "don't have the exact lyrics",
+    "cannot provide lyrics",
+    "cannot locate lyrics",
+    "without the lyrics",
+    "i can provide a detailed analysis",
+)
+_FAILURE_MARKER_RE = re.compile("|".join(map(re.escape, _FAILURE_MARKERS)))
+
+# Hedging vocabulary that suggests the template was guessed rather than derived from lyrics
+_HEDGING_WORDS = (
+    "typically",
+    "generally",
+    "commonly",
+    "usually",
+    "often",
+    "may",
+    "might",
+    "tends to",
+    "tend to",
+    "varied",
+    "varies",
+    "vary",
+    "blend",
+    "mix",
+    "mixture",
+    "overview",
+)
+_HEDGE_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(_HEDGING_WORDS, key=len, reverse=True))) + r")\b"
+)
+
+# Leads every template prompt; the formatted reference follows
+_TEMPLATE_PROMPT_HEADER = (
+    "Analyze the following references and return a concise, factual lyric blueprint.\n"
+    "- Summarize structure, perspective, tone, and key motifs.\n"
+    "- Do NOT include sample lyric lines or invented examples—only describe patterns.\n"
+    "- Keep it short and declarative so the writer does not copy phrasing.\n\n"
+)
+
+# Feedback used when the reviewer's response cannot be parsed; copied, never mutated
+_DEFAULT_FEEDBACK = {
+    "satisfied": False,
+    "style_feedback": "",
+    "plagiarism_concerns": "",
+    "revision_suggestions": "Please try again.",
+}
+
+# Reviewer fields the revision loop reads; responses lacking them are not cached
+_REVIEWER_VERDICT_FIELDS = ("satisfied", "revision_suggestions")
+
+# Decodes a JSON value at an arbitrary offset and reports where it ended
+_JSON_DECODER = json.JSONDecoder()
+
+# Byte translation table for lyric tokenization: lowercases A-Z, keeps a-z and
+# apostrophes, and maps every other byte (including UTF-8 multibyte sequences) to
+# a space. Equivalent to re.findall(r"[a-zA-Z']+", text.lower()) in a single pass.
+_TOKEN_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if 97 <= c <= 122 or c == 39 else 32
+    for c in range(256)
+)
+
+
+def _normalize_words(text: str) -> str:
+    """Lowercase text and collapse it to single-space separated words (see _TOKEN_TABLE)."""
+    return b" ".join(text.encode("utf-8").translate(_TOKEN_TABLE).split()).decode("ascii")
+
+
+def _decode_embedded_json(text: str) -> Optional[dict]:
+    """
+    Decode the first well-formed JSON object embedded in text, ignoring surrounding prose.
 
+    Each '{' is tried in turn, so stray braces or a truncated object ahead of the real
+    payload are skipped. Returns None when no offset decodes.
+    """
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            return obj
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+    return None
 
+
+@lru_cache(maxsize=256)
+def _parse_json_object(text: str) -> Optional[dict]:
+    """
+    Parse the JSON object in an agent response, bare or embedded in prose; None if absent.
+
+    Memoized because cached reviewer responses are parsed again on every hit. The
+    returned dict is shared between calls, so callers must deep-copy it before handing it out.
+    """
+    # Only attempt a direct parse when the response looks like bare JSON; models often
+    # prepend prose, and raising/catching a decode error for that case is wasted work
+    stripped = text.lstrip()
+    if stripped.startswith("{"):
+        try:
+            return _json_loads(stripped)
+        except json.JSONDecodeError:
+            pass
+
+    # Try to extract JSON from the response (might have extra text)
+    return _decode_embedded_json(text)
+
+
+def _is_reviewer_verdict(text: str) -> bool:
+    """Return True when text holds a reviewer JSON object with the fields the loop relies on."""
+    parsed = _parse_json_object(text)
+    return isinstance(parsed, dict) and all(key in parsed for key in _REVIEWER_VERDICT_FIELDS)
+
+
+def _json_object_complete(text: str) -> bool:
+    """
+    Return True once the JSON object starting at the first '{' in text is complete.
+
+    Only the first brace is tried so a nested object cannot be mistaken for the whole.
+    """
+    start = text.find("{")
+    if start == -1:
+        return False
+    try:
+        _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
 class WorkflowStatus(Enum):
     """Status of the workflow execution."""
 
@@ -27,17 +183,17 @@ class WorkflowStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FeedbackEntry:
-    """Single feedback iteration entry."""
+    """Single feedback iteration entry; entries are append-only once recorded."""
     iteration: int
     lyrics: str
     feedback: dict  # Contains: satisfied, style_feedback, plagiarism_concerns, revision_suggestions
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkflowInputs:
-    """Input data for the lyric workflow."""
+    """Input data for the lyric workflow; immutable and hashable once built from a request."""
 
     artists: str = ""
     songs: str = ""
@@ -47,7 +203,7 @@ class WorkflowInputs:
     producer_guidance: str = ""  # Production style guidance for Suno output
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowOutputs:
     """Output data from each agent in the workflow pipeline."""
 
@@ -56,9 +212,10 @@ class WorkflowOutputs:
     lyrics: Optional[str] = None
     feedback_history: List[FeedbackEntry] = field(default_factory=list)
     suno_output: Optional[dict] = None  # Contains: style_prompt, lyric_sheet
+    forbidden_phrases: Optional[List[str]] = None  # Extracted alongside the template for reuse by the writer
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowState:
     """Complete state of a workflow execution."""
 
@@ -78,55 +235,134 @@ class LyricWorkflow:
     3. LyricReviewerAgent - Critiques lyrics and provides feedback (with iteration loop)
     """
 
-    def __init__(self):
-        """Initialize the workflow with required agents."""
+    def __init__(
+        self,
+        chat_client: Optional[ChatClient] = None,
+        review_final_iteration: bool = True,
+        warm_start: bool = False,
+        use_uvloop: bool = True,
+    ):
+        """
+        Initialize the workflow with required agents.
+
+        Args:
+            chat_client: Optional client shared by every agent, bypassing per-agent config
+            review_final_iteration: Review the last allowed draft even though no revision can follow
+            warm_start: Ping every agent in the background so the first request finds open connections
+            use_uvloop: Run the background loop on uvloop when it is installed
+        """
+        self.review_final_iteration = review_final_iteration
         try:
-            self.lyric_template_agent = create_lyric_template_agent()
-            self.lyric_writer_agent = create_lyric_writer_agent()
-            self.lyric_reviewer_agent = create_lyric_reviewer_agent()
-            self.suno_producer_agent = create_suno_producer_agent()
+            self.lyric_template_agent = create_lyric_template_agent(chat_client)
+            self.lyric_writer_agent = create_lyric_writer_agent(chat_client)
+            self.lyric_reviewer_agent = create_lyric_reviewer_agent(chat_client)
+            self.suno_producer_agent = create_suno_producer_agent(chat_client)
             logger.info("LyricWorkflow initialized with all agents")
         except Exception as e:
-            logger.error(f"Error initializing LyricWorkflow: {e}")
+            logger.error("Error initializing LyricWorkflow: %s", e)
             raise
 
+        # Exact-match cache for agent calls whose output should be stable for a given prompt.
+        # Built before the loop thread starts so a bad LLM_CACHE_PATH can't leak that thread.
+        if config.llm_cache_path:
+            self._response_cache = SQLiteResponseCache(
+                config.llm_cache_path, maxsize=RESPONSE_CACHE_SIZE, ttl=config.response_cache_ttl_seconds
+            )
+        else:
+            self._response_cache = ResponseCache(
+                maxsize=RESPONSE_CACHE_SIZE, ttl=config.response_cache_ttl_seconds
+            )
+        # Cached agent calls currently awaiting a response, by cache key
+        self._inflight: Dict[bytes, "asyncio.Future[str]"] = {}
+        # Cache keys cover each agent's model and instructions, not just its name
+        self._cache_namespaces = {
+            agent.name: self._cache_namespace(agent)
+            for agent in (
+                self.lyric_template_agent,
+                self.lyric_writer_agent,
+                self.lyric_reviewer_agent,
+                self.suno_producer_agent,
+            )
+        }
+
+        # A single long-lived loop serves every agent call so sync callers (Flask
+        # request threads) never need to create, patch, or re-enter an event loop.
+        # Only this private loop uses uvloop; the global event loop policy is left alone
+        if use_uvloop and uvloop is not None:
+            self._loop = uvloop.new_event_loop()
+        else:
+            self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="LyricWorkflowLoop",
+            daemon=True,
+        )
+        self._loop_thread.start()
+
+        if warm_start:
+            # Fire and forget: construction must not wait on the network
+            asyncio.run_coroutine_threadsafe(self._warm_start(), self._loop)
+
+    # Synchronous entry points for Flask request threads. Each submits one coroutine to the
+    # background loop; the async variants below hold the actual logic.
     def run(self, inputs: WorkflowInputs) -> WorkflowState:
         """Run the pipeline end-to-end (template -> lyrics)."""
-        template_state = self.generate_template(inputs)
+        return self._run_coro(self.arun(inputs))
+
+    def run_many(self, inputs_list: Iterable[WorkflowInputs]) -> List[WorkflowState]:
+        """Run several end-to-end pipelines concurrently; states are returned in input order."""
+        return self._run_coro(self.arun_many(inputs_list))
+
+    def generate_template(self, inputs: WorkflowInputs) -> WorkflowState:
+        """Run only the template agent so the UI can gate on the reference quality."""
+        return self._run_coro(self.agenerate_template(inputs))
+
+    def generate_lyrics(
+        self,
+        inputs: WorkflowInputs,
+        template: str,
+        forbidden_phrases: Optional[List[str]] = None,
+    ) -> WorkflowState:
+        """Run the lyric writer + reviewer loop using an existing template."""
+        return self._run_coro(self.agenerate_lyrics(inputs, template, forbidden_phrases))
+
+    def run_producer(self, state: WorkflowState) -> WorkflowState:
+        """Run the producer agent to generate Suno-compatible outputs."""
+        return self._run_coro(self.arun_producer(state))
+
+    async def arun(self, inputs: WorkflowInputs) -> WorkflowState:
+        """Run the pipeline end-to-end (template -> lyrics)."""
+        template_state = await self.agenerate_template(inputs)
         if template_state.status != WorkflowStatus.COMPLETE:
             return template_state
 
-        lyrics_state = self.generate_lyrics(inputs, template_state.outputs.template or "")
+        lyrics_state = await self.agenerate_lyrics(
+            inputs,
+            template_state.outputs.template or "",
+            forbidden_phrases=template_state.outputs.forbidden_phrases,
+        )
         lyrics_state.outputs.template = template_state.outputs.template
         return lyrics_state
 
-    def generate_template(self, inputs: WorkflowInputs) -> WorkflowState:
+    async def arun_many(self, inputs_list: Iterable[WorkflowInputs]) -> List[WorkflowState]:
+        """Run several end-to-end pipelines concurrently; states are returned in input order."""
+        # arun reports failures on the returned state, so one bad input can't cancel the rest
+        return list(await asyncio.gather(*(self.arun(inputs) for inputs in inputs_list)))
+
+    async def agenerate_template(self, inputs: WorkflowInputs) -> WorkflowState:
         """Run only the template agent so the UI can gate on the reference quality."""
         state = WorkflowState(inputs=inputs, status=WorkflowStatus.RUNNING)
 
         reference = self._build_reference(inputs)
-        if not reference.strip():
+        if not reference:
             state.status = WorkflowStatus.ERROR
             state.error = "Please provide at least one of: Artist(s), Song(s), lyrics, or other guidance."
             return state
 
         logger.info("Generating style template from references...")
-        prompt = (
-            "Analyze the following references and return a concise, factual lyric blueprint.\n"
-            "- Summarize structure, perspective, tone, and key motifs.\n"
-            "- Do NOT include sample lyric lines or invented examples—only describe patterns.\n"
-            "- Keep it short and declarative so the writer does not copy phrasing.\n\n"
-            f"{reference}"
-        )
-        loop = self._get_event_loop()
-
+        prompt = _TEMPLATE_PROMPT_HEADER + reference
         try:
-            if loop.is_running():
-                import nest_asyncio
-                nest_asyncio.apply()
-                template = loop.run_until_complete(self._run_agent_async(self.lyric_template_agent, prompt))
-            else:
-                template = loop.run_until_complete(self._run_agent_async(self.lyric_template_agent, prompt))
+            template, forbidden_phrases = await self._generate_template_async(prompt, inputs)
         except Exception as exc:  # pragma: no cover - agent failure paths are runtime dependent
             logger.error("Template generation failed: %s", exc)
             state.status = WorkflowStatus.ERROR
@@ -135,6 +371,7 @@ class LyricWorkflow:
 
         state.outputs.template = template
         state.outputs.idea = inputs.idea
+        state.outputs.forbidden_phrases = forbidden_phrases
 
         if self._template_missing(template) or self._template_requires_lyrics(template, inputs):
             needs_lyrics = not inputs.lyrics.strip()
@@ -149,7 +386,12 @@ class LyricWorkflow:
         state.status = WorkflowStatus.COMPLETE
         return state
 
-    def generate_lyrics(self, inputs: WorkflowInputs, template: str) -> WorkflowState:
+    async def agenerate_lyrics(
+        self,
+        inputs: WorkflowInputs,
+        template: str,
+        forbidden_phrases: Optional[List[str]] = None,
+    ) -> WorkflowState:
         """Run the lyric writer + reviewer loop using an existing template."""
         state = WorkflowState(
             inputs=inputs,
@@ -167,14 +409,15 @@ class LyricWorkflow:
             state.error = "Add a song idea or title before generating lyrics."
             return state
 
-        loop = self._get_event_loop()
-
         try:
             logger.info("Generating and reviewing lyrics from template + idea...")
-            forbidden_phrases = self._build_forbidden_phrases(inputs)
+            if forbidden_phrases is None:
+                forbidden_phrases = await asyncio.to_thread(self._build_forbidden_phrases, inputs)
+            state.outputs.forbidden_phrases = forbidden_phrases
             logger.debug("Forbidden phrases (%s): %s", len(forbidden_phrases), forbidden_phrases)
-            lyrics, feedback_history = loop.run_until_complete(
-                self._generate_and_review_lyrics(template, inputs.idea, forbidden_phrases)
+            local_phrases = self._local_forbidden_phrases(inputs) if config.local_forbidden_check else []
+            lyrics, feedback_history = await self._generate_and_review_lyrics(
+                template, inputs.idea, forbidden_phrases, local_phrases
             )
             state.outputs.lyrics = lyrics
             state.outputs.feedback_history = feedback_history
@@ -186,6 +429,25 @@ class LyricWorkflow:
 
         return state
 
+    async def _generate_template_async(self, prompt: str, inputs: WorkflowInputs) -> Tuple[str, List[str]]:
+        """Run the template agent while forbidden phrases are extracted on a worker thread."""
+        # Equivalent references differing only in case, spacing, or stray commas share a template
+        cache_text = _TEMPLATE_PROMPT_HEADER + self._normalize_reference(inputs)
+        template, forbidden_phrases = await asyncio.gather(
+            self._run_agent_async(
+                self.lyric_template_agent,
+                prompt,
+                use_cache=True,
+                cache_text=cache_text,
+                # Only cache templates agenerate_template will accept; a retry must re-ask the agent
+                cache_if=lambda text: not (
+                    self._template_missing(text) or self._template_requires_lyrics(text, inputs)
+                ),
+            ),
+            asyncio.to_thread(self._build_forbidden_phrases, inputs),
+        )
+        return template, forbidden_phrases
+
     def _template_missing(self, template: Optional[str]) -> bool:
         """Heuristically detect when the template agent returned nothing useful."""
         if not template:
@@ -200,42 +462,11 @@ class LyricWorkflow:
         if inputs.lyrics.strip():
             return False
         lowered = template.lower()
-        failure_markers = [
-            "could not find",
-            "couldn't find",
-            "no lyrics",
-            "lyrics not found",
-            "not enough reference",
-            "insufficient reference",
-            "don't have the exact lyrics",
-            "cannot provide lyrics",
-            "cannot locate lyrics",
-            "without the lyrics",
-            "i can provide a detailed analysis",
-        ]
-        if any(marker in lowered for marker in failure_markers):
+        if _FAILURE_MARKER_RE.search(lowered):
             return True
 
         # If the response leans heavily on hedging words, assume it guessed and ask for lyrics
-        hedging_words = [
-            "typically",
-            "generally",
-            "commonly",
-            "usually",
-            "often",
-            "may",
-            "might",
-            "tends to",
-            "tend to",
-            "varied",
-            "varies",
-            "vary",
-            "blend",
-            "mix",
-            "mixture",
-            "overview",
-        ]
-        hedge_hits = sum(lowered.count(word) for word in hedging_words)
+        hedge_hits = len(_HEDGE_RE.findall(lowered))
         if hedge_hits >= 2:
             return True
 
@@ -252,7 +483,13 @@ class LyricWorkflow:
             return template_state
         return self.generate_lyrics(inputs, template_state.outputs.template or "")
 
-    async def _generate_and_review_lyrics(self, template: str, idea: str, forbidden_phrases: Optional[List[str]] = None) -> tuple:
+    async def _generate_and_review_lyrics(
+        self,
+        template: str,
+        idea: str,
+        forbidden_phrases: Optional[List[str]] = None,
+        local_phrases: Optional[List[str]] = None,
+    ) -> tuple:
         """
         Generate lyrics and iterate with reviewer until satisfied or max iterations.
 
@@ -260,117 +497,275 @@ class LyricWorkflow:
             template: The style template
             idea: The song idea/title
             forbidden_phrases: Titles/phrases from the references that must not appear in new lyrics
+            local_phrases: Normalized phrases whose verbatim reuse rejects a draft without review
 
         Returns:
             tuple: (final_lyrics, feedback_history)
         """
-        feedback_history = []
+        feedback_history: List[FeedbackEntry] = []
         current_lyrics = None
         previous_lyrics = None
         satisfied = False
         iteration = 0
 
+        # Content that is constant across iterations leads each prompt so the bytes sent to the
+        # provider share an identical prefix and can hit its prompt cache; per-iteration text follows.
+        forbidden_list = ", ".join(forbidden_phrases) if forbidden_phrases else ""
+        writer_prefix = (
+            "Style Template (analysis only; do NOT reuse exact titles/phrases):\n"
+            f"{template}\n\n"
+            f"Song Idea/Title: {idea}\n"
+            f"Forbidden titles/phrases to avoid entirely (do not paraphrase): {forbidden_list or 'None explicitly provided; still avoid lifting hooks or album titles from the template.'}\n\n"
+        )
+        reviewer_prefix = (
+            f"Style Template:\n{template}\n\n"
+            f"Song Idea/Title: {idea}\n\n"
+            f"Forbidden titles/phrases that must NOT appear (if present, set satisfied=false and flag plagiarism): {forbidden_list or 'Reference song/album titles and hooks implied by the template.'}\n\n"
+        )
+        logger.debug("Shared prompt prefixes: writer=%s chars, reviewer=%s chars", len(writer_prefix), len(reviewer_prefix))
+
         while iteration < MAX_ITERATIONS and not satisfied:
             iteration += 1
-            logger.info(f"Iteration {iteration}/{MAX_ITERATIONS}")
+            logger.info("Iteration %s/%s", iteration, MAX_ITERATIONS)
 
         # Generate lyrics
             if iteration == 1:
                 # First iteration: just idea
-                writer_prompt = (
-                    "Style Template (analysis only; do NOT reuse exact titles/phrases):\n"
-                    f"{template}\n\n"
-                    f"Song Idea/Title: {idea}\n"
-                    f"Forbidden titles/phrases to avoid entirely (do not paraphrase): {', '.join(forbidden_phrases) if forbidden_phrases else 'None explicitly provided; still avoid lifting hooks or album titles from the template.'}\n\n"
-                    "Generate complete lyrics matching this template with fresh wording."
-                )
+                writer_prompt = writer_prefix + "Generate complete lyrics matching this template with fresh wording."
             else:
                 # Subsequent iterations: include feedback
                 if not feedback_history:
                     logger.warning("No prior feedback available for revision; reverting to first-pass prompt.")
                     last_feedback = {"revision_suggestions": "Rewrite with fresh imagery; avoid any repeated hooks/titles."}
                 else:
-                    last_feedback = feedback_history[-1]["feedback"]
-                    previous_lyrics = feedback_history[-1]["lyrics"]
+                    last_entry = feedback_history[-1]
+                    last_feedback = last_entry.feedback
+                    previous_lyrics = last_entry.lyrics
                 writer_prompt = (
-                    "Style Template (analysis only; do NOT reuse exact titles/phrases):\n"
-                    f"{template}\n\n"
-                    f"Song Idea/Title: {idea}\n"
-                    f"Forbidden titles/phrases to avoid entirely (do not paraphrase): {', '.join(forbidden_phrases) if forbidden_phrases else 'None explicitly provided; still avoid lifting hooks or album titles from the template.'}\n\n"
+                    f"{writer_prefix}"
                     f"Previous draft:\n{previous_lyrics or 'N/A'}\n\n"
                     f"Revision Feedback:\n{last_feedback['revision_suggestions']}\n\n"
                     "Generate revised lyrics incorporating the feedback above without reusing any reference hooks."
                 )
 
-            logger.debug(f"Writer prompt (len={len(writer_prompt)}): {writer_prompt[:600]}")
-            current_lyrics = await self._run_agent_async(self.lyric_writer_agent, writer_prompt)
-            logger.info(f"Generated lyrics ({len(current_lyrics)} chars)")
-
-            # Review lyrics
-            reviewer_prompt = (
-                f"Style Template:\n{template}\n\n"
-                f"Song Idea/Title: {idea}\n\n"
-                f"Generated Lyrics:\n{current_lyrics}\n\n"
-                f"Forbidden titles/phrases that must NOT appear (if present, set satisfied=false and flag plagiarism): {', '.join(forbidden_phrases) if forbidden_phrases else 'Reference song/album titles and hooks implied by the template.'}\n\n"
-                "Provide feedback in JSON format."
+            logger.debug("Writer prompt (len=%s): %.600s", len(writer_prompt), writer_prompt)
+
+            # Feedback on the last allowed draft can't drive a revision; it is only informational
+            review = iteration < MAX_ITERATIONS or self.review_final_iteration
+
+            # Draft and review candidates concurrently; keep the first the reviewer accepts
+            candidates = await asyncio.gather(
+                *(
+                    self._write_and_review(writer_prompt, reviewer_prefix, review=review, local_phrases=local_phrases)
+                    for _ in range(config.lyric_candidates)
+                )
+            )
+            current_lyrics, feedback_dict = next(
+                (candidate for candidate in candidates if candidate[1].get("satisfied", False)),
+                candidates[0],
+            )
+
+            feedback_history.append(
+                FeedbackEntry(iteration=iteration, lyrics=current_lyrics, feedback=feedback_dict)
             )
-            logger.debug(f"Reviewer prompt (len={len(reviewer_prompt)}): {reviewer_prompt[:600]}")
-            feedback_json = await self._run_agent_async(self.lyric_reviewer_agent, reviewer_prompt)
-
-            # Parse feedback
-            try:
-                # Try to extract JSON from response
-                feedback_dict = self._parse_reviewer_feedback(feedback_json)
-            except Exception as e:
-                logger.warning(f"Failed to parse feedback JSON: {e}. Using default feedback.")
-                feedback_dict = {
-                    "satisfied": False,
-                    "style_feedback": feedback_json,
-                    "plagiarism_concerns": "",
-                    "revision_suggestions": "Please try again.",
-                }
-
-            feedback_history.append({
-                "iteration": iteration,
-                "lyrics": current_lyrics,
-                "feedback": feedback_dict
-            })
             previous_lyrics = current_lyrics
 
             satisfied = feedback_dict.get("satisfied", False)
-            logger.info(f"Reviewer satisfied: {satisfied}")
+            logger.info("Reviewer satisfied: %s", satisfied)
+
+        return current_lyrics, feedback_history
+
+    async def _write_and_review(
+        self,
+        writer_prompt: str,
+        reviewer_prefix: str,
+        review: bool = True,
+        local_phrases: Optional[List[str]] = None,
+    ) -> Tuple[str, dict]:
+        """
+        Generate one lyric draft and return it with the reviewer's parsed feedback.
+
+        Drafts that repeat any of local_phrases (normalized with _normalize_words) are
+        rejected locally and never sent to the reviewer.
+        """
+        lyrics = await self._run_agent_async(self.lyric_writer_agent, writer_prompt)
+        logger.info("Generated lyrics (%s chars)", len(lyrics))
+
+        if local_phrases:
+            # Pad with spaces so phrases only match on whole-word boundaries
+            normalized_lyrics = f" {_normalize_words(lyrics)} "
+            hits = [phrase for phrase in local_phrases if f" {phrase} " in normalized_lyrics]
+            if hits:
+                logger.info("Draft repeats %s forbidden phrase(s); skipping reviewer", len(hits))
+                quoted = ", ".join(f'"{phrase}"' for phrase in hits)
+                return lyrics, {
+                    "satisfied": False,
+                    "style_feedback": "",
+                    "plagiarism_concerns": f"Draft reuses forbidden phrases verbatim: {quoted}",
+                    "revision_suggestions": f"Rewrite every line containing {quoted} with fresh wording.",
+                }
 
-        return current_lyrics, [FeedbackEntry(**entry) for entry in feedback_history]
+        if not review:
+            return lyrics, {
+                "satisfied": False,
+                "style_feedback": "Final draft was not reviewed.",
+                "plagiarism_concerns": "",
+                "revision_suggestions": "",
+            }
 
-    async def _run_agent_async(self, agent, prompt: str) -> str:
+        # Review lyrics
+        reviewer_prompt = (
+            f"{reviewer_prefix}"
+            f"Generated Lyrics:\n{lyrics}\n\n"
+            "Provide feedback in JSON format."
+        )
+        logger.debug("Reviewer prompt (len=%s): %.600s", len(reviewer_prompt), reviewer_prompt)
+        # A writer that repeats a draft verbatim gets the same verdict without another review;
+        # unparseable responses aren't cached so a retry gets a fresh review
+        feedback_json = await self._run_agent_async(
+            self.lyric_reviewer_agent,
+            reviewer_prompt,
+            use_cache=True,
+            stop_after_json=True,
+            cache_if=_is_reviewer_verdict,
+        )
+
+        # Parse feedback
+        try:
+            # Try to extract JSON from response
+            feedback_dict = self._parse_reviewer_feedback(feedback_json)
+        except Exception as e:
+            logger.warning("Failed to parse feedback JSON: %s. Using default feedback.", e)
+            feedback_dict = {**_DEFAULT_FEEDBACK, "style_feedback": feedback_json}
+
+        return lyrics, feedback_dict
+
+    async def _run_agent_async(
+        self,
+        agent,
+        prompt: str,
+        use_cache: bool = False,
+        on_token: Optional[Callable[[str], None]] = None,
+        stop_after_json: bool = False,
+        cache_text: Optional[str] = None,
+        cache_if: Optional[Callable[[str], bool]] = None,
+    ) -> str:
         """
-        Run an agent asynchronously and accumulate its output.
+        Run an agent asynchronously, streaming and accumulating its output.
+
+        Cached calls that join an identical request already in flight receive its result
+        without streaming it to their own on_token.
 
         Args:
             agent: The agent to run
             prompt: The input prompt
+            use_cache: Reuse a previous output for an identical agent/prompt pair
+            on_token: Optional callback invoked with each streamed text chunk
+            stop_after_json: Close the stream once a complete JSON object has arrived
+            cache_text: Text to key the cache on in place of prompt, e.g. a normalized form of it
+            cache_if: Predicate an output must pass to be cached, so rejected responses aren't replayed
 
         Returns:
             str: The accumulated output
         """
-        output = None
-        accumulated_text = []
+        if not use_cache:
+            output = await self._call_agent(agent, prompt, on_token, stop_after_json)
+            return output or "No output generated"
 
+        cache_key = ResponseCache.make_key(
+            self._cache_namespaces.get(agent.name, agent.name),
+            prompt if cache_text is None else cache_text,
+        )
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            # stats() can query the SQLite backend, so only gather it when it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response cache hit for %s (%s)", agent.name, self._response_cache.stats())
+            return cached
+
+        # Identical concurrent calls (double submits, run_many batches) share one request.
+        # It is shielded so a caller that gives up doesn't cancel it for the others.
+        call = self._inflight.get(cache_key)
+        if call is None:
+            call = asyncio.ensure_future(self._call_agent(agent, prompt, on_token, stop_after_json))
+            self._inflight[cache_key] = call
+            call.add_done_callback(partial(self._finish_inflight, cache_key, cache_if))
+        else:
+            logger.debug("Joining in-flight call to %s", agent.name)
+        output = await asyncio.shield(call)
+        return output or "No output generated"
+
+    def _finish_inflight(
+        self,
+        cache_key: bytes,
+        cache_if: Optional[Callable[[str], bool]],
+        call: "asyncio.Future[str]",
+    ) -> None:
+        """Retire a shared agent call, caching its output if it produced any and passes cache_if."""
+        del self._inflight[cache_key]
+        if call.cancelled() or call.exception() is not None:
+            return
+        output = call.result()
+        if output and (cache_if is None or cache_if(output)):
+            self._response_cache.set(cache_key, output)
+
+    async def _call_agent(
+        self,
+        agent,
+        prompt: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        stop_after_json: bool = False,
+    ) -> str:
+        """Stream one agent run on a fresh thread, bounded by the configured timeout."""
+        accumulated_text: List[str] = []
         try:
             # Create a new thread for this agent run
             thread = agent.get_new_thread()
-            response = await agent.run(prompt, thread=thread)
+            timeout = config.agent_timeout_seconds or None
+            await asyncio.wait_for(
+                self._stream_agent(agent, prompt, thread, accumulated_text, on_token, stop_after_json),
+                timeout=timeout,
+            )
+            output = "".join(accumulated_text)
 
-            if response:
-                output = response.text if hasattr(response, 'text') else str(response)
+            logger.debug("Agent output: %s chars", len(output))
+            return output
 
-            logger.debug(f"Agent output: {len(output) if output else 0} chars")
-            return output or "No output generated"
+        except asyncio.TimeoutError:
+            message = f"Agent {agent.name} timed out after {config.agent_timeout_seconds}s"
+            logger.error(message)
+            raise TimeoutError(message) from None
 
         except Exception as e:
-            logger.error(f"Error running agent: {e}")
+            logger.error("Error running agent: %s", e)
             raise
 
+    async def _stream_agent(
+        self,
+        agent,
+        prompt: str,
+        thread,
+        chunks: List[str],
+        on_token: Optional[Callable[[str], None]] = None,
+        stop_after_json: bool = False,
+    ) -> None:
+        """Consume an agent's response stream into chunks, forwarding each to on_token."""
+        stream = agent.run_stream(prompt, thread=thread)
+        try:
+            async for update in stream:
+                text = update.text
+                if not text:
+                    continue
+                chunks.append(text)
+                if on_token is not None:
+                    on_token(text)
+                # Anything after the object is commentary the parsers discard anyway
+                if stop_after_json and "}" in text and _json_object_complete("".join(chunks)):
+                    logger.debug("Complete JSON received from %s; closing stream", agent.name)
+                    break
+        finally:
+            await stream.aclose()
+
     def _parse_reviewer_feedback(self, feedback_json: str) -> dict:
         """
         Parse JSON feedback from reviewer.
@@ -384,26 +779,42 @@ class LyricWorkflow:
         Raises:
             json.JSONDecodeError: If JSON is invalid
         """
-        # Try to extract JSON from the response (might have extra text)
-        try:
-            # First try direct parse
-            return json.loads(feedback_json)
-        except json.JSONDecodeError:
-            # Try to find JSON in the response
-            import re
-            json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', feedback_json, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            raise
-
-    def _get_event_loop(self):
-        """Get or create an event loop."""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        return loop
+        parsed = _parse_json_object(feedback_json)
+        if parsed is not None:
+            # Deep copy: nested lists/dicts would otherwise still point into the memoized object
+            return copy.deepcopy(parsed)
+        raise json.JSONDecodeError("No JSON object found in reviewer response", feedback_json, 0)
+
+    @staticmethod
+    def _cache_namespace(agent) -> str:
+        """Digest an agent's name, model, and instructions: everything besides the prompt that shapes its output."""
+        client = getattr(agent, "chat_client", None)
+        model = getattr(client, "model_id", None) or getattr(client, "deployment_name", None) or ""
+        options = getattr(agent, "chat_options", None)
+        instructions = getattr(options, "instructions", None) or getattr(agent, "instructions", None) or ""
+        return ResponseCache.make_key(agent.name, f"{model}|{instructions}").hex()
+
+    async def _warm_start(self) -> None:
+        """Send a trivial prompt to each agent, logging rather than raising on failure."""
+        agents = (
+            self.lyric_template_agent,
+            self.lyric_writer_agent,
+            self.lyric_reviewer_agent,
+            self.suno_producer_agent,
+        )
+        results = await asyncio.gather(
+            *(agent.run("ping", thread=agent.get_new_thread()) for agent in agents),
+            return_exceptions=True,
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            logger.warning("Agent warm start failed for %s/%s agents: %s", len(failures), len(agents), failures[0])
+        else:
+            logger.info("Agent warm start complete")
+
+    def _run_coro(self, coro):
+        """Run a coroutine on the workflow's background loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
 
     def _build_reference(self, inputs: WorkflowInputs) -> str:
         """
@@ -413,31 +824,76 @@ class LyricWorkflow:
             inputs: WorkflowInputs containing the user's specifications
 
         Returns:
-            Formatted reference string for the agents
+            Formatted reference string for the agents, or "" when every field is blank
         """
-        parts = []
-        if inputs.artists.strip():
-            parts.append(f"Artist(s): {inputs.artists.strip()}")
-        if inputs.songs.strip():
-            parts.append(f"Song(s): {inputs.songs.strip()}")
-        if inputs.guidance.strip():
-            parts.append(f"Additional guidance: {inputs.guidance.strip()}")
-        if inputs.lyrics.strip():
+        # Each field is stripped exactly once; blank fields are skipped
+        labelled = (
+            ("Artist(s)", inputs.artists.strip()),
+            ("Song(s)", inputs.songs.strip()),
+            ("Additional guidance", inputs.guidance.strip()),
+        )
+        parts = [f"{label}: {value}" for label, value in labelled if value]
+        lyrics = inputs.lyrics.strip()
+        if lyrics:
             parts.append("Provided Lyrics (authoritative reference for analysis only; do NOT reuse exact phrases):")
-            parts.append(inputs.lyrics.strip())
+            parts.append(lyrics)
         return "\n".join(parts)
 
+    def _normalize_reference(self, inputs: WorkflowInputs) -> str:
+        """
+        Reduce the reference fields to a canonical form for cache lookups.
+
+        Only the comma-separated name lists (artists, songs) are canonicalized: empty items
+        are dropped and each name is lowercased with its whitespace collapsed. Guidance and
+        lyrics are only stripped, since casing and line/stanza layout shape the template.
+        Fields are joined with a separator users can't type.
+        """
+        normalized = [
+            ", ".join(filter(None, (" ".join(item.split()).lower() for item in value.split(","))))
+            for value in (inputs.artists, inputs.songs)
+        ]
+        normalized.append(inputs.guidance.strip())
+        normalized.append(inputs.lyrics.strip())
+        return "\x1f".join(normalized)
+
+    def _local_forbidden_phrases(self, inputs: WorkflowInputs) -> List[str]:
+        """
+        Normalize the explicit song titles and artist names that can reject a draft locally.
+
+        Only entries of three or more words qualify: they are specific enough that a verbatim
+        repeat is plagiarism. Shorter names and phrases mined from reference lyrics (which are
+        often generic, like "i love you") are left to the reviewer's judgement. Names that
+        appear in the user's own idea are dropped, since a draft is expected to use them.
+        """
+        idea = f" {_normalize_words(inputs.idea)} "
+        names = (item for value in (inputs.songs, inputs.artists) for item in value.split(","))
+        return [
+            name
+            for name in dict.fromkeys(map(_normalize_words, names))
+            if name.count(" ") >= 2 and f" {name} " not in idea
+        ]
+
     def _build_forbidden_phrases(self, inputs: WorkflowInputs) -> List[str]:
         """Collect reference titles/phrases that should never appear in generated lyrics."""
+        # Retries and re-runs with the same references reuse the cached result; each caller
+        # gets its own list since the outputs store it
+        return list(
+            self._forbidden_phrases_for(inputs.songs.strip(), inputs.artists.strip(), inputs.lyrics.strip())
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _forbidden_phrases_for(songs: str, artists: str, lyrics: str) -> Tuple[str, ...]:
+        """Compute forbidden phrases for stripped reference fields; see _build_forbidden_phrases."""
         phrases: List[str] = []
-        if inputs.songs.strip():
-            phrases.extend([s.strip() for s in inputs.songs.split(",") if s.strip()])
-        if inputs.artists.strip():
-            phrases.extend([a.strip() for a in inputs.artists.split(",") if a.strip()])
+        if songs:
+            phrases.extend([s.strip() for s in songs.split(",") if s.strip()])
+        if artists:
+            phrases.extend([a.strip() for a in artists.split(",") if a.strip()])
         # Explicit lyrics reference should not be quoted verbatim
-        if inputs.lyrics.strip():
+        if lyrics:
             phrases.append("Any direct lines or titles from the provided lyrics")
-            phrases.extend(self._extract_forbidden_phrases_from_lyrics(inputs.lyrics))
+            phrases.extend(LyricWorkflow._extract_forbidden_phrases_from_lyrics(lyrics))
         # Deduplicate while preserving order
         seen = set()
         deduped = []
@@ -447,43 +903,38 @@ class LyricWorkflow:
                 continue
             seen.add(key)
             deduped.append(p)
-        return deduped
+        return tuple(deduped)
 
-    def _extract_forbidden_phrases_from_lyrics(self, lyrics: str, max_phrases: int = 15) -> List[str]:
+    @staticmethod
+    def _extract_forbidden_phrases_from_lyrics(lyrics: str, max_phrases: int = 15) -> List[str]:
         """
         Heuristically extract recurring n-grams from provided lyrics to treat as forbidden hooks.
 
         We look for 3-6 word n-grams that appear at least twice and return the top ones.
         """
-        import re
+        import heapq
         from collections import Counter
 
-        # Normalize and tokenize
-        tokens = re.findall(r"[a-zA-Z']+", lyrics.lower())
-        if not tokens:
-            return []
+        # Normalize and tokenize in one bytes-level pass
+        tokens = lyrics.encode("utf-8").translate(_TOKEN_TABLE).split()
 
-        ngram_counts: Counter[Tuple[str, ...]] = Counter()
+        repeated: List[Tuple[Tuple[bytes, ...], int]] = []
         for n in range(3, 7):  # 3-6 grams
-            for i in range(len(tokens) - n + 1):
-                ngram = tuple(tokens[i : i + n])
-                ngram_counts[ngram] += 1
-
-        # Keep n-grams that repeat
-        repeated = [(ng, c) for ng, c in ngram_counts.items() if c >= 2]
-        repeated.sort(key=lambda x: (-x[1], -len(x[0])))  # frequency desc, then length desc
-
-        phrases: List[str] = []
-        for ng, count in repeated:
-            phrase = " ".join(ng)
-            if phrase not in phrases:
-                phrases.append(phrase)
-            if len(phrases) >= max_phrases:
+            # Zipping staggered views yields every n-token window; Counter tallies
+            # the whole iterator in C rather than one tuple at a time.
+            counts = Counter(zip(*(tokens[k:] for k in range(n))))
+            found = [(ng, c) for ng, c in counts.items() if c >= 2]
+            if not found:
+                # Every longer n-gram contains one of these, so none of them can repeat either
                 break
+            repeated.extend(found)
 
-        return phrases
+        # Keep the top repeating n-grams: frequency desc, then length desc.
+        # N-grams of different lengths never collide, so the joined phrases need no dedupe.
+        top = heapq.nlargest(max_phrases, repeated, key=lambda x: (x[1], len(x[0])))
+        return [b" ".join(ng).decode("ascii") for ng, _ in top]
 
-    def run_producer(self, state: WorkflowState) -> WorkflowState:
+    async def arun_producer(self, state: WorkflowState) -> WorkflowState:
         """
         Run the producer agent to generate Suno-compatible outputs.
 
@@ -506,50 +957,56 @@ class LyricWorkflow:
         try:
             logger.info("Running producer agent to generate Suno outputs...")
 
-            # Build prompt for producer
-            prompt_parts = [
-                "Finalized Lyrics:",
-                state.outputs.lyrics,
-                "",
-                "Style Template:",
-                state.outputs.template or "No template provided",
-            ]
-
-            if state.inputs.producer_guidance.strip():
-                prompt_parts.extend([
-                    "",
-                    "Production Guidance:",
-                    state.inputs.producer_guidance.strip()
-                ])
-
-            prompt = "\n".join(prompt_parts)
-
-            # Run producer agent
-            loop = self._get_event_loop()
-
-            if loop.is_running():
-                import nest_asyncio
-                nest_asyncio.apply()
-                producer_output = loop.run_until_complete(
-                    self._run_agent_async(self.suno_producer_agent, prompt)
-                )
-            else:
-                producer_output = loop.run_until_complete(
-                    self._run_agent_async(self.suno_producer_agent, prompt)
-                )
-
-            # Parse JSON output
-            suno_output = self._parse_producer_output(producer_output)
+            suno_output = await self._run_producer_async(state)
             state.outputs.suno_output = suno_output
 
             logger.info("Producer agent completed successfully")
 
         except Exception as e:
-            logger.error(f"Producer error: {e}")
+            logger.error("Producer error: %s", e)
             state.error = f"Producer error: {str(e)}"
 
         return state
 
+    async def _run_producer_async(self, state: WorkflowState) -> dict:
+        """
+        Build the producer prompt, run the producer agent, and parse its output.
+
+        Prompt assembly and parsing are plain CPU work on potentially long
+        lyrics, so they run in a worker thread to keep the event loop free.
+        """
+        prompt = await asyncio.to_thread(self._build_producer_prompt, state)
+        # Producer output is sampled, so replaying it for an identical prompt is opt-in;
+        # output without a JSON object would only replay the fallback parse, so it isn't kept
+        producer_output = await self._run_agent_async(
+            self.suno_producer_agent,
+            prompt,
+            use_cache=config.cache_producer_output,
+            stop_after_json=True,
+            cache_if=lambda text: _parse_json_object(text) is not None,
+        )
+        return await asyncio.to_thread(self._parse_producer_output, producer_output)
+
+    def _build_producer_prompt(self, state: WorkflowState) -> str:
+        """Build the prompt for the producer agent from finalized lyrics and template."""
+        prompt_parts = [
+            "Finalized Lyrics:",
+            state.outputs.lyrics,
+            "",
+            "Style Template:",
+            state.outputs.template or "No template provided",
+        ]
+
+        producer_guidance = state.inputs.producer_guidance.strip()
+        if producer_guidance:
+            prompt_parts.extend([
+                "",
+                "Production Guidance:",
+                producer_guidance
+            ])
+
+        return "\n".join(prompt_parts)
+
     def _parse_producer_output(self, output: str) -> dict:
         """
         Parse JSON output from producer agent.
@@ -563,18 +1020,12 @@ class LyricWorkflow:
         Raises:
             json.JSONDecodeError: If JSON is invalid
         """
-        try:
-            # First try direct parse
-            return json.loads(output)
-        except json.JSONDecodeError:
-            # Try to extract JSON from the response
-            import re
-            json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', output, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            # If still can't parse, return error structure
-            logger.warning(f"Failed to parse producer output as JSON: {output[:200]}")
-            return {
-                "style_prompt": "Error: Could not parse style prompt",
-                "lyric_sheet": output
-            }
+        parsed = _parse_json_object(output)
+        if parsed is not None:
+            return copy.deepcopy(parsed)
+        # If still can't parse, return error structure
+        logger.warning("Failed to parse producer output as JSON: %.200s", output)
+        return {
+            "style_prompt": "Error: Could not parse style prompt",
+            "lyric_sheet": output
+        }